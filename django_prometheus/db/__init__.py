@@ -10,6 +10,10 @@ from django_prometheus.db.metrics import (
     aws_failover_success_total,
     aws_failover_failed_total,
     aws_transaction_resolution_unknown_total,
+    aws_pool_hits_total,
+    aws_pool_misses_total,
+    circuit_open_total,
+    circuit_short_circuited_total,
 )
 
 __all__ = [
@@ -23,4 +27,8 @@ __all__ = [
     "aws_failover_success_total",
     "aws_failover_failed_total",
     "aws_transaction_resolution_unknown_total",
+    "aws_pool_hits_total",
+    "aws_pool_misses_total",
+    "circuit_open_total",
+    "circuit_short_circuited_total",
 ]
@@ -0,0 +1,69 @@
+import logging
+import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class MetricEventQueue:
+    """Applies metric updates on a background thread.
+
+    Query threads only enqueue a `(fn, value)` pair, e.g. a counter's
+    `inc` or a histogram's `observe` with its argument, and never touch
+    the metric's lock themselves. A daemon thread applies the updates in
+    order, so exported values may lag a few milliseconds behind.
+    """
+
+    def __init__(self):
+        self._events = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, fn, value):
+        self._events.put_nowait((fn, value))
+
+    def start(self):
+        """Starts the background thread if it isn't running yet."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="django-prometheus-metrics", daemon=True)
+                self._thread.start()
+
+    def drain(self):
+        """Applies all pending updates in the calling thread."""
+        while True:
+            try:
+                fn, value = self._events.get_nowait()
+            except queue.Empty:
+                return
+            self._apply(fn, value)
+
+    def _run(self):
+        while True:
+            fn, value = self._events.get()
+            self._apply(fn, value)
+
+    def _apply(self, fn, value):
+        try:
+            fn(value)
+        except Exception:
+            logger.exception("Failed to apply metric update")
+
+    def _after_fork(self):
+        # Threads don't survive fork(). Start over in the child with an
+        # empty queue: the parent still applies whatever it had queued.
+        was_running = self._thread is not None
+        self._events = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+        if was_running:
+            self.start()
+
+
+metric_events = MetricEventQueue()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=metric_events._after_fork)
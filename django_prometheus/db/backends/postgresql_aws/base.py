@@ -1,13 +1,19 @@
+import functools
 import logging
+import time
 
 from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError
 from django.db.backends.postgresql import base
-from django.db.backends.postgresql.base import Cursor
 
 from django_prometheus.db import (
     aws_failover_failed_total,
     aws_failover_success_total,
+    aws_pool_hits_total,
+    aws_pool_misses_total,
     aws_transaction_resolution_unknown_total,
+    circuit_open_total,
+    circuit_short_circuited_total,
     connection_errors_total,
     connections_total,
     errors_total,
@@ -15,8 +21,15 @@ from django_prometheus.db import (
     execute_total,
     query_duration_seconds,
 )
-from django_prometheus.db.common import DatabaseWrapperMixin, ExceptionCounterByType
+from django_prometheus.db.async_metrics import metric_events
+from django_prometheus.db.backends.postgresql_aws.circuit_breaker import CircuitBreaker
+from django_prometheus.db.backends.postgresql_aws.pool import ConnectionPool
+from django_prometheus.db.backends.postgresql_aws.writer_discovery import WriterDiscovery
+from django_prometheus.db.common import DatabaseWrapperMixin
 
+# A missing wrapper is only reported when the backend is actually used, so
+# that importing this module (e.g. to inspect it) doesn't require it.
+_aws_wrapper_import_error = None
 try:
     import psycopg
     from aws_advanced_python_wrapper import AwsWrapperConnection
@@ -26,132 +39,300 @@ try:
         TransactionResolutionUnknownError,
     )
 except ImportError as e:
-    raise ImproperlyConfigured(
-        "AWS Advanced Python Wrapper is required for this backend. "
-        "Install it with: pip install aws-advanced-python-wrapper"
-    ) from e
+    _aws_wrapper_import_error = e
+    psycopg = AwsWrapperConnection = None
+
+    class FailoverFailedError(Exception):
+        pass
+
+    class FailoverSuccessError(Exception):
+        pass
+
+    class TransactionResolutionUnknownError(Exception):
+        pass
+
 
 logger = logging.getLogger(__name__)
 
+# Writer discovery by database alias, so that cursors can ask for an
+# immediate lookup when they see a failover.
+_writer_discoveries = {}
+
+
+class AwsPrometheusCursor:
+    """Wraps an AWS wrapper cursor, counting queries and failover events.
+
+    Everything but execute() and executemany() is forwarded to the wrapped
+    cursor. The alias, vendor and the metric children labelled with them
+    are class attributes: use `_cursor_cls_for()` to get a subclass bound
+    to a given database rather than instantiating this class directly.
+    """
+
+    __slots__ = ("_cursor",)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, attr):
+        return getattr(self._cursor, attr)
+
+    def __iter__(self):
+        return iter(self._cursor)
 
-class AwsPrometheusCursor(Cursor):
-    def __init__(self, connection, alias, vendor):
-        super().__init__(connection)
-        self.alias = alias
-        self.vendor = vendor
-        self._labels = {"alias": alias, "vendor": vendor}
+    def __enter__(self):
+        return self
+
+    def __exit__(self, typ, value, traceback):
+        self._cursor.close()
 
     def execute(self, sql, params=None):
-        execute_total.labels(self.alias, self.vendor).inc()
-        with (
-            query_duration_seconds.labels(**self._labels).time(),
-            ExceptionCounterByType(errors_total, extra_labels=self._labels),
-        ):
+        self._count_execute(1)
+        start = time.perf_counter_ns()
+        try:
             return self._execute_with_failover_handling(sql, params)
+        except BaseException as e:
+            self._count_error(e)
+            raise
+        finally:
+            self._observe_duration((time.perf_counter_ns() - start) * 1e-9)
 
     def executemany(self, sql, param_list):
-        param_count = len(param_list) if param_list else 0
-        execute_total.labels(self.alias, self.vendor).inc(param_count)
-        execute_many_total.labels(self.alias, self.vendor).inc(param_count)
-        with (
-            query_duration_seconds.labels(**self._labels).time(),
-            ExceptionCounterByType(errors_total, extra_labels=self._labels),
-        ):
+        # Materialize iterators once: they have no len(), and a retry after
+        # a failover has to be able to send the same rows again.
+        if not isinstance(param_list, (list, tuple)):
+            param_list = list(param_list)
+        if not param_list:
+            # Nothing to send; the driver would no-op anyway.
+            return None
+        param_count = len(param_list)
+        self._record_execute(param_count)
+        start = time.perf_counter_ns()
+        try:
             return self._executemany_with_failover_handling(sql, param_list)
+        except BaseException as e:
+            self._count_error(e)
+            raise
+        finally:
+            self._observe_duration((time.perf_counter_ns() - start) * 1e-9)
+
+    def _record_execute(self, n):
+        self._count_execute(n)
+        self._count_execute_many(n)
+
+    def _count_error(self, exc):
+        exc_type = type(exc)
+        counter = self._error_counters.get(exc_type)
+        if counter is None:
+            counter = self._error_counters.setdefault(
+                exc_type, errors_total.labels(self.alias, self.vendor, exc_type.__name__)
+            )
+        counter.inc()
 
     def _execute_with_failover_handling(self, sql, params=None):
-        try:
-            return super().execute(sql, params)
-        except FailoverSuccessError:
-            logger.info("Database failover completed successfully, retrying query")
-            aws_failover_success_total.labels(self.alias, self.vendor).inc()
-            self._configure_session_state()
-            return super().execute(sql, params)
-        except FailoverFailedError as e:
-            logger.error("Database failover failed: %s", e)
-            aws_failover_failed_total.labels(self.alias, self.vendor).inc()
-            raise
-        except TransactionResolutionUnknownError as e:
-            logger.error("Transaction resolution unknown after failover: %s", e)
-            aws_transaction_resolution_unknown_total.labels(self.alias, self.vendor).inc()
-            raise
+        return self._run_with_failover(self._cursor.execute, sql, params)
 
     def _executemany_with_failover_handling(self, sql, param_list):
+        return self._run_with_failover(self._cursor.executemany, sql, param_list)
+
+    def _run_with_failover(self, fn, *args):
         try:
-            return super().executemany(sql, param_list)
+            return fn(*args)
         except FailoverSuccessError:
-            logger.info("Database failover completed successfully, retrying executemany")
-            aws_failover_success_total.labels(self.alias, self.vendor).inc()
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Database failover completed successfully, retrying query")
+            self._failover_success.inc()
+            discovery = _writer_discoveries.get(self.alias)
+            if discovery is not None:
+                discovery.refresh()
             self._configure_session_state()
-            return super().executemany(sql, param_list)
+            return fn(*args)
         except FailoverFailedError as e:
-            logger.error("Database failover failed during executemany: %s", e)
-            aws_failover_failed_total.labels(self.alias, self.vendor).inc()
+            logger.error("Database failover failed: %s", e)
+            self._failover_failed.inc()
             raise
         except TransactionResolutionUnknownError as e:
-            logger.error("Transaction resolution unknown during executemany: %s", e)
-            aws_transaction_resolution_unknown_total.labels(self.alias, self.vendor).inc()
+            logger.error("Transaction resolution unknown after failover: %s", e)
+            self._transaction_unknown.inc()
             raise
 
     def _configure_session_state(self):
         pass
 
 
+@functools.cache
+def _cursor_cls_for(alias, vendor, async_metrics=False):
+    """Returns an AwsPrometheusCursor subclass bound to `alias` and `vendor`.
+
+    There are only a handful of databases per process, so resolving the
+    labelled metric children once per database saves doing it for every
+    cursor, i.e. for every query.
+
+    With `async_metrics`, the per-query counter and histogram updates are
+    handed to the background `metric_events` queue instead of being
+    applied by the query thread.
+    """
+    if async_metrics:
+        metric_events.start()
+
+    def recorder(fn):
+        # A staticmethod is never bound to the cursor, whereas a bare
+        # functools.partial becomes a method descriptor in Python 3.14.
+        return staticmethod(functools.partial(metric_events.put, fn) if async_metrics else fn)
+
+    # Both execute counters are bumped through their values directly rather
+    # than through inc(), which only adds a negative-amount check.
+    return type(
+        f"AwsPrometheusCursor_{alias}_{vendor}",
+        (AwsPrometheusCursor,),
+        {
+            "__slots__": (),
+            "alias": alias,
+            "vendor": vendor,
+            "_count_execute": recorder(execute_total.labels(alias, vendor)._value.inc),
+            "_count_execute_many": recorder(execute_many_total.labels(alias, vendor)._value.inc),
+            "_observe_duration": recorder(query_duration_seconds.labels(alias, vendor).observe),
+            "_failover_success": aws_failover_success_total.labels(alias, vendor),
+            "_failover_failed": aws_failover_failed_total.labels(alias, vendor),
+            "_transaction_unknown": aws_transaction_resolution_unknown_total.labels(alias, vendor),
+            # errors_total children by exception class, filled in as errors occur.
+            "_error_counters": {},
+        },
+    )
+
+
 class DatabaseWrapper(DatabaseWrapperMixin, base.DatabaseWrapper):
     def __init__(self, settings_dict, alias=None):
+        if _aws_wrapper_import_error is not None:
+            raise ImproperlyConfigured(
+                "AWS Advanced Python Wrapper is required for this backend. "
+                "Install it with: pip install aws-advanced-python-wrapper"
+            ) from _aws_wrapper_import_error
         super().__init__(settings_dict, alias)
         options = self.settings_dict.get("OPTIONS", {})
         self.aws_plugins = options.get("aws_plugins", "failover,host_monitoring")
         self.connect_timeout = options.get("connect_timeout", 30)
         self.socket_timeout = options.get("socket_timeout", 30)
+        self.max_conns = options.get("MAX_CONNS", 0)
+        self.max_idle = options.get("MAX_IDLE", 300.0)
+        self.async_metrics = options.get("async_metrics", False)
+        # psycopg instantiates cursor_factory(connection) itself, so it must
+        # be a cursor class; pick the same one Django's own backend uses.
+        if options.get("server_side_binding") is True:
+            self.cursor_factory = base.ServerBindingCursor
+        else:
+            self.cursor_factory = base.Cursor
+        # Connect arguments that don't depend on conn_params, built once.
+        self._connect_kwargs_template = {
+            "plugins": self.aws_plugins,
+            "connect_timeout": self.connect_timeout,
+            "socket_timeout": self.socket_timeout,
+            "autocommit": False,
+            "cursor_factory": self.cursor_factory,
+        }
+        self._pool = None
+        self._circuit_breaker = None
+        failure_threshold = options.get("circuit_breaker_threshold", 5)
+        if failure_threshold:
+            self._circuit_breaker = CircuitBreaker.for_alias(
+                self.alias,
+                failure_threshold=failure_threshold,
+                reset_timeout=options.get("circuit_breaker_reset_timeout", 30.0),
+            )
+        self._writer_discovery = None
+        cluster_id = options.get("rds_cluster_id")
+        if cluster_id:
+            self._writer_discovery = WriterDiscovery.for_cluster(
+                cluster_id,
+                region=options.get("rds_region"),
+                interval=options.get("rds_poll_interval", 5.0),
+            )
+            _writer_discoveries[self.alias] = self._writer_discovery
 
     def get_new_connection(self, conn_params):
+        if self._writer_discovery is not None:
+            writer_endpoint = self._writer_discovery.writer_endpoint
+            if writer_endpoint:
+                conn_params = {**conn_params, "host": writer_endpoint}
+
+        if self.max_conns:
+            self._pool = ConnectionPool.for_alias(self.alias, conn_params, self.max_conns, self.max_idle)
+            connection = self._pool.get()
+            if connection is not None:
+                aws_pool_hits_total.labels(self.alias, self.vendor).inc()
+                return connection
+            aws_pool_misses_total.labels(self.alias, self.vendor).inc()
+
+        breaker = self._circuit_breaker
+        if breaker is not None and not breaker.allow_request():
+            circuit_short_circuited_total.labels(self.alias, self.vendor).inc()
+            raise OperationalError(f"Circuit breaker for database '{self.alias}' is open, not connecting")
+
         connections_total.labels(self.alias, self.vendor).inc()
+        connected = False
         try:
             host = conn_params.get("host", "localhost")
             port = conn_params.get("port", 5432)
-            database = conn_params.get("database", "")
-            user = conn_params.get("user", "")
-            password = conn_params.get("password", "")
-            options = conn_params.get("options", {})
-
-            connection = AwsWrapperConnection.connect(
-                psycopg.Connection.connect,
+            kwargs = self._connect_kwargs_template.copy()
+            kwargs.update(
                 host=host,
                 port=port,
-                dbname=database,
-                user=user,
-                password=password,
-                plugins=self.aws_plugins,
-                connect_timeout=self.connect_timeout,
-                socket_timeout=self.socket_timeout,
-                autocommit=False,
-                **options,
+                dbname=conn_params.get("database", ""),
+                user=conn_params.get("user", ""),
+                password=conn_params.get("password", ""),
             )
+            kwargs.update(conn_params.get("options", {}))
+
+            connection = AwsWrapperConnection.connect(psycopg.Connection.connect, **kwargs)
 
-            connection.cursor_factory = lambda conn: AwsPrometheusCursor(conn, self.alias, self.vendor)
-            logger.info("Successfully created AWS wrapper connection to %s:%s", host, port)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully created AWS wrapper connection to %s:%s", host, port)
+            connected = True
             return connection
 
         except Exception as e:
             connection_errors_total.labels(self.alias, self.vendor).inc()
             logger.error("Failed to create AWS wrapper connection: %s", e)
             raise
+        finally:
+            # Also runs for BaseExceptions (timeouts, interrupts): a trial
+            # attempt that never reports back would keep the circuit half-open.
+            if breaker is not None:
+                if connected:
+                    breaker.record_success()
+                elif breaker.record_failure():
+                    circuit_open_total.labels(self.alias, self.vendor).inc()
 
     def create_cursor(self, name=None):
-        if name:
-            cursor = self.connection.cursor(name=name)
-        else:
-            cursor = self.connection.cursor()
-        return AwsPrometheusCursor(cursor.connection, self.alias, self.vendor)
+        # Wrap the cursor the AWS wrapper hands out, so queries still go
+        # through its plugin pipeline (where failover is detected), instead
+        # of building a second cursor on its connection.
+        cursor = self.connection.cursor(name) if name else self.connection.cursor()
+        return _cursor_cls_for(self.alias, self.vendor, self.async_metrics)(cursor)
 
     def _close(self):
         if self.connection is not None:
+            if self._pool is not None and not self.in_atomic_block and self._release_to_pool():
+                return
             try:
                 self.connection.close()
             except Exception as e:
                 logger.warning("Error closing AWS wrapper connection: %s", e)
 
+    def _release_to_pool(self):
+        """Tries to hand the current connection back to the pool.
+
+        The rollback comes last so the next user starts clean: outside
+        autocommit, the SELECT 1 run by is_usable() opens a transaction of
+        its own. Returns False if the connection should be closed instead.
+        """
+        if not self.is_usable():
+            return False
+        try:
+            self.connection.rollback()
+        except Exception:
+            return False
+        return self._pool.put(self.connection)
+
     def is_usable(self):
         try:
             with self.connection.cursor() as cursor:
@@ -160,11 +341,3 @@ class DatabaseWrapper(DatabaseWrapperMixin, base.DatabaseWrapper):
         except Exception as e:
             logger.warning("Connection is not usable: %s", e)
             return False
-
-    def ensure_connection(self):
-        if self.connection is None:
-            self.connect()
-        elif not self.is_usable():
-            logger.info("Connection is not usable, reconnecting...")
-            self.close()
-            self.connect()
@@ -0,0 +1,72 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops connection attempts to a database that keeps failing.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    `allow_request()` returns False, so callers can fail fast instead of
+    piling more connection attempts onto a struggling cluster. Once
+    `reset_timeout` seconds have passed a single trial attempt is let
+    through: its success closes the circuit, its failure opens it again.
+    If a trial never reports back, another one is allowed after a further
+    `reset_timeout`.
+
+    Use `CircuitBreaker.for_alias()` to share one breaker between all the
+    threads connecting to the same database.
+    """
+
+    _breakers = {}
+    _breakers_lock = threading.Lock()
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_alias(cls, alias, failure_threshold=5, reset_timeout=30.0):
+        with cls._breakers_lock:
+            breaker = cls._breakers.get(alias)
+            if breaker is None:
+                breaker = cls._breakers[alias] = cls(failure_threshold, reset_timeout)
+            return breaker
+
+    def allow_request(self):
+        """Returns whether a connection attempt may go ahead."""
+        if self.state == CLOSED:
+            return True
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if now - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._opened_at = now
+                return True
+            return False
+
+    def record_success(self):
+        if self.state == CLOSED and not self._failures:
+            return
+        with self._lock:
+            self.state = CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        """Records a failed attempt. Returns True if it opened the circuit."""
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
@@ -0,0 +1,114 @@
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Hashable
+
+logger = logging.getLogger(__name__)
+
+
+def _params_key(conn_params):
+    """Returns a hashable key identifying a set of connection parameters."""
+    return frozenset((k, v if isinstance(v, Hashable) else repr(v)) for k, v in conn_params.items())
+
+
+def _close_connection(connection):
+    try:
+        connection.close()
+    except Exception as e:
+        logger.warning("Error closing pooled AWS wrapper connection: %s", e)
+
+
+class ConnectionPool:
+    """A LIFO pool of idle AWS wrapper connections.
+
+    Django closes its connection at the end of every request unless
+    CONN_MAX_AGE is set, so without a pool every request pays for a new
+    TCP/TLS handshake, authentication and the wrapper's plugin setup.
+    The pool keeps up to `max_conns` idle connections around instead.
+    It never blocks: when it is empty the caller opens a new connection,
+    and when it is full the returned connection is simply closed.
+    Connections left idle for more than `max_idle` seconds are closed
+    rather than handed out, since the server or a load balancer may have
+    dropped them in the meantime.
+
+    There is one pool per database alias; use `ConnectionPool.for_alias()`
+    to get it. When the alias starts connecting with other parameters,
+    e.g. to a new writer after a failover, its previous pool is closed.
+    """
+
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, max_conns, max_idle=None, params_key=None):
+        self.max_conns = max_conns
+        self.max_idle = max_idle
+        self.params_key = params_key
+        self.closed = False
+        self._idle = queue.LifoQueue(maxsize=max_conns)
+
+    @classmethod
+    def for_alias(cls, alias, conn_params, max_conns, max_idle=None):
+        key = _params_key(conn_params)
+        pool = cls._pools.get(alias)
+        if pool is not None and pool.params_key == key:
+            return pool
+        with cls._pools_lock:
+            previous = cls._pools.get(alias)
+            if previous is not None and previous.params_key == key:
+                return previous
+            pool = cls._pools[alias] = cls(max_conns, max_idle, key)
+        if previous is not None:
+            previous.close()
+        return pool
+
+    def get(self):
+        """Returns an idle connection, or None if the pool is empty."""
+        while True:
+            try:
+                connection, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                return None
+            if self.max_idle is None or time.monotonic() - released_at < self.max_idle:
+                return connection
+            _close_connection(connection)
+
+    def put(self, connection):
+        """Hands `connection` back to the pool.
+
+        Returns False if the pool is already full or closed, in which case
+        the caller remains responsible for closing the connection.
+        """
+        if self.closed:
+            return False
+        try:
+            self._idle.put_nowait((connection, time.monotonic()))
+        except queue.Full:
+            return False
+        if self.closed:
+            # close() ran meanwhile and may have missed this connection.
+            self.close()
+        return True
+
+    def close(self):
+        """Closes the idle connections and refuses any handed back later."""
+        self.closed = True
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            _close_connection(connection)
+
+
+def _reset_after_fork():
+    # Connections pooled before fork() share their socket with the parent:
+    # drop them in the child without closing, which would end the parent's
+    # session too.
+    ConnectionPool._pools = {}
+    ConnectionPool._pools_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
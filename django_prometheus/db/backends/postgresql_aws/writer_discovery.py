@@ -0,0 +1,105 @@
+import logging
+import os
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+
+class WriterDiscovery:
+    """Tracks the writer instance of an Aurora/RDS cluster.
+
+    After a failover the cluster endpoint's DNS can keep pointing at the
+    old writer for minutes. A daemon thread polls the RDS API every
+    `interval` seconds instead, so new connections can go straight to the
+    instance that is currently the writer. `writer_endpoint` is None
+    until the first successful lookup.
+
+    Use `WriterDiscovery.for_cluster()` to share a single polling thread
+    between all the connections to a cluster.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cluster_id, region=None, interval=5.0):
+        try:
+            import boto3
+        except ImportError as e:
+            raise ImproperlyConfigured(
+                "boto3 is required for RDS writer discovery (the 'rds_cluster_id' option). "
+                "Install it with: pip install boto3"
+            ) from e
+        self.cluster_id = cluster_id
+        self.region = region
+        self.interval = interval
+        self.writer_endpoint = None
+        self._client = boto3.client("rds", region_name=region)
+        self._addresses = {}
+        self._refresh = threading.Event()
+
+    @classmethod
+    def for_cluster(cls, cluster_id, region=None, interval=5.0):
+        with cls._instances_lock:
+            discovery = cls._instances.get(cluster_id)
+            if discovery is None:
+                discovery = cls._instances[cluster_id] = cls(cluster_id, region, interval)
+                discovery.start()
+            return discovery
+
+    def start(self):
+        thread = threading.Thread(
+            target=self._run,
+            name=f"rds-writer-discovery-{self.cluster_id}",
+            daemon=True,
+        )
+        thread.start()
+
+    def refresh(self):
+        """Asks the polling thread to look the writer up right away."""
+        self._refresh.set()
+
+    def _run(self):
+        while True:
+            # Clear before looking up, so a refresh() requested meanwhile
+            # triggers another lookup instead of being lost.
+            self._refresh.clear()
+            try:
+                self.writer_endpoint = self._lookup_writer()
+            except Exception as e:
+                logger.warning("Failed to look up the writer of RDS cluster %s: %s", self.cluster_id, e)
+            self._refresh.wait(self.interval)
+
+    def _after_fork(self):
+        # The polling thread didn't survive fork(): forget the parent's
+        # answer, which could be stale by the time it is used, and poll
+        # again with a fresh client (boto3 clients aren't fork-safe).
+        import boto3
+
+        self.writer_endpoint = None
+        self._client = boto3.client("rds", region_name=self.region)
+        self._refresh = threading.Event()
+        self.start()
+
+    def _lookup_writer(self):
+        response = self._client.describe_db_clusters(DBClusterIdentifier=self.cluster_id)
+        members = response["DBClusters"][0]["DBClusterMembers"]
+        writer_id = next((m["DBInstanceIdentifier"] for m in members if m["IsClusterWriter"]), None)
+        if writer_id is None:
+            return None
+        # Instance endpoints don't change, so only ask for each one once.
+        if writer_id not in self._addresses:
+            response = self._client.describe_db_instances(DBInstanceIdentifier=writer_id)
+            self._addresses[writer_id] = response["DBInstances"][0]["Endpoint"]["Address"]
+        return self._addresses[writer_id]
+
+
+def _restart_after_fork():
+    WriterDiscovery._instances_lock = threading.Lock()
+    for discovery in WriterDiscovery._instances.values():
+        discovery._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
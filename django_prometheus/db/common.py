@@ -25,15 +25,15 @@ class ExceptionCounterByType:
     def __init__(self, counter, type_label="type", extra_labels=None):
         self._counter = counter
         self._type_label = type_label
-        self._labels = dict(extra_labels)  # Copy labels since we modify them.
+        # Shared, never modified: the type label is only merged in on error.
+        self._labels = extra_labels or {}
 
     def __enter__(self):
         pass
 
     def __exit__(self, typ, value, traceback):
         if typ is not None:
-            self._labels.update({self._type_label: typ.__name__})
-            self._counter.labels(**self._labels).inc()
+            self._counter.labels(**self._labels, **{self._type_label: typ.__name__}).inc()
 
 
 class DatabaseWrapperMixin:
@@ -63,7 +63,7 @@ def ExportingCursorWrapper(cursor_class, alias, vendor):
         def execute(self, *args, **kwargs):
             execute_total.labels(alias, vendor).inc()
             with (
-                query_duration_seconds.labels(**labels).time(),
+                query_duration_seconds.labels(alias, vendor).time(),
                 ExceptionCounterByType(errors_total, extra_labels=labels),
             ):
                 return super().execute(*args, **kwargs)
@@ -72,7 +72,7 @@ def ExportingCursorWrapper(cursor_class, alias, vendor):
             execute_total.labels(alias, vendor).inc(len(param_list))
             execute_many_total.labels(alias, vendor).inc(len(param_list))
             with (
-                query_duration_seconds.labels(**labels).time(),
+                query_duration_seconds.labels(alias, vendor).time(),
                 ExceptionCounterByType(errors_total, extra_labels=labels),
             ):
                 return super().executemany(query, param_list, *args, **kwargs)
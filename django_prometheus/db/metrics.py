@@ -68,3 +68,31 @@ aws_transaction_resolution_unknown_total = Counter(
     ["alias", "vendor"],
     namespace=NAMESPACE,
 )
+
+aws_pool_hits_total = Counter(
+    "django_db_aws_pool_hits_total",
+    "Counter of connections reused from the AWS backend connection pool by database and vendor.",
+    ["alias", "vendor"],
+    namespace=NAMESPACE,
+)
+
+aws_pool_misses_total = Counter(
+    "django_db_aws_pool_misses_total",
+    "Counter of connection requests the AWS backend connection pool could not serve.",
+    ["alias", "vendor"],
+    namespace=NAMESPACE,
+)
+
+circuit_open_total = Counter(
+    "django_db_circuit_open_total",
+    "Counter of times the connection circuit breaker opened by database and vendor.",
+    ["alias", "vendor"],
+    namespace=NAMESPACE,
+)
+
+circuit_short_circuited_total = Counter(
+    "django_db_circuit_short_circuited_total",
+    "Counter of connection attempts rejected by an open circuit breaker by database and vendor.",
+    ["alias", "vendor"],
+    namespace=NAMESPACE,
+)
@@ -0,0 +1,30 @@
+import pytest
+from prometheus_client import CollectorRegistry, Counter
+
+from django_prometheus.db.common import ExceptionCounterByType
+
+
+class TestExceptionCounterByType:
+    def testDefaultExtraLabels(self):
+        """Tests that extra_labels can be omitted."""
+        registry = CollectorRegistry()
+        counter = Counter("exceptions_total", "Exceptions.", ["type"], registry=registry)
+        with pytest.raises(ValueError):
+            with ExceptionCounterByType(counter):
+                raise ValueError
+        assert registry.get_sample_value("exceptions_total", {"type": "ValueError"}) == 1
+
+    def testLabelMerge(self):
+        """Tests that the type label is merged without modifying extra_labels."""
+        registry = CollectorRegistry()
+        counter = Counter("exceptions_total", "Exceptions.", ["method", "type"], registry=registry)
+        labels = {"method": "GET"}
+        for exc in (KeyError, KeyError, TypeError):
+            with pytest.raises(exc):
+                with ExceptionCounterByType(counter, extra_labels=labels):
+                    raise exc
+        with ExceptionCounterByType(counter, extra_labels=labels):
+            pass
+        assert labels == {"method": "GET"}
+        assert registry.get_sample_value("exceptions_total", {"method": "GET", "type": "KeyError"}) == 2
+        assert registry.get_sample_value("exceptions_total", {"method": "GET", "type": "TypeError"}) == 1
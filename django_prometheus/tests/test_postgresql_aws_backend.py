@@ -2,7 +2,9 @@
 Tests for PostgreSQL AWS backend integration.
 """
 
+import logging
 import unittest
+import warnings
 from unittest.mock import patch, MagicMock
 
 from django.test import TestCase
@@ -14,6 +16,11 @@ from django_prometheus.db import (
     aws_failover_success_total,
     aws_failover_failed_total,
     aws_transaction_resolution_unknown_total,
+    aws_pool_hits_total,
+    circuit_short_circuited_total,
+    errors_total,
+    execute_many_total,
+    execute_total,
 )
 
 
@@ -36,6 +43,16 @@ class PostgreSQLAWSBackendTest(TestCase):
             },
         }
 
+    def tearDown(self):
+        """Forget pools, circuit breakers and writer discovery shared across DatabaseWrappers."""
+        from django_prometheus.db.backends.postgresql_aws.circuit_breaker import CircuitBreaker
+        from django_prometheus.db.backends.postgresql_aws.pool import ConnectionPool
+        from django_prometheus.db.backends.postgresql_aws.writer_discovery import WriterDiscovery
+
+        ConnectionPool._pools.clear()
+        CircuitBreaker._breakers.clear()
+        WriterDiscovery._instances.clear()
+
     @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
     @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
     def test_import_backend(self, mock_aws_wrapper, mock_psycopg):
@@ -47,11 +64,15 @@ class PostgreSQLAWSBackendTest(TestCase):
             self.fail("Backend import should not fail when AWS wrapper is available")
 
     def test_import_error_without_aws_wrapper(self):
-        """Test that backend raises ImproperlyConfigured without AWS wrapper."""
-        with patch.dict('sys.modules', {'aws_advanced_python_wrapper': None}):
+        """Test that using the backend raises ImproperlyConfigured without AWS wrapper."""
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+
+        import_error = ImportError("No module named 'aws_advanced_python_wrapper'")
+        with patch('django_prometheus.db.backends.postgresql_aws.base._aws_wrapper_import_error', import_error):
             with self.assertRaises(ImproperlyConfigured) as cm:
-                from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
-            self.assertIn("AWS Advanced Python Wrapper is required", str(cm.exception))
+                DatabaseWrapper(self.database_config, alias='default')
+        self.assertIn("AWS Advanced Python Wrapper is required", str(cm.exception))
+        self.assertIs(cm.exception.__cause__, import_error)
 
     @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
     @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
@@ -117,9 +138,27 @@ class PostgreSQLAWSBackendTest(TestCase):
         
         # Verify logging
         mock_logger.info.assert_called_with(
-            "Successfully created AWS wrapper connection to test-cluster.cluster-xyz.us-east-1.rds.amazonaws.com:5432"
+            "Successfully created AWS wrapper connection to %s:%s",
+            "test-cluster.cluster-xyz.us-east-1.rds.amazonaws.com",
+            5432,
         )
 
+    @patch('django_prometheus.db.backends.postgresql_aws.base.logger')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_connection_creation_info_log_disabled(self, mock_aws_wrapper, mock_psycopg, mock_logger):
+        """Test that the connection info message is skipped when INFO is disabled."""
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+
+        mock_logger.isEnabledFor.return_value = False
+        wrapper = DatabaseWrapper(self.database_config, alias='default')
+
+        connection = wrapper.get_new_connection({'host': 'test-host', 'port': 5432, 'options': {}})
+
+        self.assertIsNotNone(connection)
+        mock_logger.isEnabledFor.assert_called_with(logging.INFO)
+        mock_logger.info.assert_not_called()
+
     @patch('django_prometheus.db.backends.postgresql_aws.base.logger')
     @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
     @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
@@ -156,85 +195,497 @@ class PostgreSQLAWSBackendTest(TestCase):
         self.assertEqual(final_errors, initial_errors + 1)  # Error counted
         
         # Verify error logging
-        mock_logger.error.assert_called_with("Failed to create AWS wrapper connection: Connection failed")
+        mock_logger.error.assert_called_once()
+        self.assertEqual(mock_logger.error.call_args[0][0], "Failed to create AWS wrapper connection: %s")
+        self.assertEqual(str(mock_logger.error.call_args[0][1]), "Connection failed")
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_create_cursor_wraps_wrapper_cursor(self, mock_aws_wrapper, mock_psycopg):
+        """Test that queries go through the cursor of the AWS wrapper connection."""
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+
+        wrapper = DatabaseWrapper(self.database_config, alias='default')
+        wrapper.connection = MagicMock()
+
+        cursor = wrapper.create_cursor()
+        cursor.execute("SELECT 1")
+        wrapper.connection.cursor.assert_called_once_with()
+        wrapper.connection.cursor.return_value.execute.assert_called_once_with("SELECT 1", None)
+
+        wrapper.create_cursor(name='server_side')
+        wrapper.connection.cursor.assert_called_with('server_side')
 
     @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
     @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
     def test_failover_success_metrics(self, mock_aws_wrapper, mock_psycopg):
         """Test that failover success metrics are recorded."""
-        from django_prometheus.db.backends.postgresql_aws.base import AwsPrometheusCursor
+        from django_prometheus.db.backends.postgresql_aws.base import _cursor_cls_for
         from aws_advanced_python_wrapper.errors import FailoverSuccessError
         
         # Create cursor instance
-        mock_connection = MagicMock()
-        cursor = AwsPrometheusCursor(mock_connection, 'default', 'postgresql')
-        
-        # Mock the parent execute to raise FailoverSuccessError on first call
-        with patch.object(cursor.__class__.__bases__[0], 'execute') as mock_execute:
-            mock_execute.side_effect = [FailoverSuccessError(), None]  # Fail then succeed
-            
-            # Record initial metric value
-            initial_failovers = aws_failover_success_total.labels('default', 'postgresql')._value.get() or 0
-            
-            # Execute query
-            cursor.execute("SELECT 1")
-            
-            # Verify metrics were updated
-            final_failovers = aws_failover_success_total.labels('default', 'postgresql')._value.get()
-            self.assertEqual(final_failovers, initial_failovers + 1)
+        mock_cursor = MagicMock()
+        cursor = _cursor_cls_for('default', 'postgresql')(mock_cursor)
+        
+        # Mock the wrapped execute to raise FailoverSuccessError on first call
+        mock_cursor.execute.side_effect = [FailoverSuccessError(), None]  # Fail then succeed
+        
+        # Record initial metric value
+        initial_failovers = aws_failover_success_total.labels('default', 'postgresql')._value.get() or 0
+        
+        # Execute query
+        cursor.execute("SELECT 1")
+        
+        # Verify metrics were updated
+        final_failovers = aws_failover_success_total.labels('default', 'postgresql')._value.get()
+        self.assertEqual(final_failovers, initial_failovers + 1)
 
     @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
     @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
     def test_failover_failed_metrics(self, mock_aws_wrapper, mock_psycopg):
         """Test that failover failure metrics are recorded."""
-        from django_prometheus.db.backends.postgresql_aws.base import AwsPrometheusCursor
+        from django_prometheus.db.backends.postgresql_aws.base import _cursor_cls_for
         from aws_advanced_python_wrapper.errors import FailoverFailedError
         
         # Create cursor instance
-        mock_connection = MagicMock()
-        cursor = AwsPrometheusCursor(mock_connection, 'default', 'postgresql')
-        
-        # Mock the parent execute to raise FailoverFailedError
-        with patch.object(cursor.__class__.__bases__[0], 'execute') as mock_execute:
-            mock_execute.side_effect = FailoverFailedError("Failover failed")
-            
-            # Record initial metric value
-            initial_failures = aws_failover_failed_total.labels('default', 'postgresql')._value.get() or 0
-            
-            # Execute query and expect exception
-            with self.assertRaises(FailoverFailedError):
-                cursor.execute("SELECT 1")
-            
-            # Verify metrics were updated
-            final_failures = aws_failover_failed_total.labels('default', 'postgresql')._value.get()
-            self.assertEqual(final_failures, initial_failures + 1)
+        mock_cursor = MagicMock()
+        cursor = _cursor_cls_for('default', 'postgresql')(mock_cursor)
+        
+        # Mock the wrapped execute to raise FailoverFailedError
+        mock_cursor.execute.side_effect = FailoverFailedError("Failover failed")
+        
+        # Record initial metric value
+        initial_failures = aws_failover_failed_total.labels('default', 'postgresql')._value.get() or 0
+        
+        # Execute query and expect exception
+        with self.assertRaises(FailoverFailedError):
+            cursor.execute("SELECT 1")
+        
+        # Verify metrics were updated
+        final_failures = aws_failover_failed_total.labels('default', 'postgresql')._value.get()
+        self.assertEqual(final_failures, initial_failures + 1)
 
     @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
     @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
     def test_transaction_resolution_unknown_metrics(self, mock_aws_wrapper, mock_psycopg):
         """Test that transaction resolution unknown metrics are recorded."""
-        from django_prometheus.db.backends.postgresql_aws.base import AwsPrometheusCursor
+        from django_prometheus.db.backends.postgresql_aws.base import _cursor_cls_for
         from aws_advanced_python_wrapper.errors import TransactionResolutionUnknownError
         
         # Create cursor instance
-        mock_connection = MagicMock()
-        cursor = AwsPrometheusCursor(mock_connection, 'default', 'postgresql')
-        
-        # Mock the parent execute to raise TransactionResolutionUnknownError
-        with patch.object(cursor.__class__.__bases__[0], 'execute') as mock_execute:
-            mock_execute.side_effect = TransactionResolutionUnknownError("Unknown transaction state")
-            
-            # Record initial metric value
-            initial_unknown = aws_transaction_resolution_unknown_total.labels('default', 'postgresql')._value.get() or 0
-            
-            # Execute query and expect exception
-            with self.assertRaises(TransactionResolutionUnknownError):
+        mock_cursor = MagicMock()
+        cursor = _cursor_cls_for('default', 'postgresql')(mock_cursor)
+        
+        # Mock the wrapped execute to raise TransactionResolutionUnknownError
+        mock_cursor.execute.side_effect = TransactionResolutionUnknownError("Unknown transaction state")
+        
+        # Record initial metric value
+        initial_unknown = aws_transaction_resolution_unknown_total.labels('default', 'postgresql')._value.get() or 0
+        
+        # Execute query and expect exception
+        with self.assertRaises(TransactionResolutionUnknownError):
+            cursor.execute("SELECT 1")
+        
+        # Verify metrics were updated
+        final_unknown = aws_transaction_resolution_unknown_total.labels('default', 'postgresql')._value.get()
+        self.assertEqual(final_unknown, initial_unknown + 1)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_errors_counted_by_type(self, mock_aws_wrapper, mock_psycopg):
+        """Test that query errors are counted by exception type."""
+        from django_prometheus.db.backends.postgresql_aws.base import _cursor_cls_for
+
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = ValueError("boom")
+        cursor = _cursor_cls_for('default', 'postgresql')(mock_cursor)
+
+        initial_errors = errors_total.labels('default', 'postgresql', 'ValueError')._value.get() or 0
+
+        for _ in range(2):
+            with self.assertRaises(ValueError):
                 cursor.execute("SELECT 1")
-            
-            # Verify metrics were updated
-            final_unknown = aws_transaction_resolution_unknown_total.labels('default', 'postgresql')._value.get()
-            self.assertEqual(final_unknown, initial_unknown + 1)
 
+        final_errors = errors_total.labels('default', 'postgresql', 'ValueError')._value.get()
+        self.assertEqual(final_errors, initial_errors + 2)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_executemany_empty_param_list(self, mock_aws_wrapper, mock_psycopg):
+        """Test that an empty executemany neither hits the driver nor the metrics."""
+        from django_prometheus.db.backends.postgresql_aws.base import _cursor_cls_for
+
+        mock_cursor = MagicMock()
+        cursor = _cursor_cls_for('default', 'postgresql')(mock_cursor)
+
+        initial_many = execute_many_total.labels('default', 'postgresql')._value.get() or 0
+
+        cursor.executemany("INSERT INTO t VALUES (%s)", [])
+
+        mock_cursor.executemany.assert_not_called()
+        final_many = execute_many_total.labels('default', 'postgresql')._value.get()
+        self.assertEqual(final_many, initial_many)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_executemany_failover_retry_with_generator(self, mock_aws_wrapper, mock_psycopg):
+        """Test that executemany resends every row after failover, even from a generator."""
+        from aws_advanced_python_wrapper.errors import FailoverSuccessError
+
+        from django_prometheus.db.backends.postgresql_aws.base import _cursor_cls_for
+
+        sent = []
+
+        def executemany(sql, param_list):
+            sent.append(list(param_list))
+            if len(sent) == 1:
+                raise FailoverSuccessError()
+
+        mock_cursor = MagicMock()
+        mock_cursor.executemany.side_effect = executemany
+        cursor = _cursor_cls_for('default', 'postgresql')(mock_cursor)
+
+        cursor.executemany("INSERT INTO t VALUES (%s)", ((i,) for i in range(3)))
+
+        self.assertEqual(sent, [[(0,), (1,), (2,)], [(0,), (1,), (2,)]])
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_async_metrics(self, mock_aws_wrapper, mock_psycopg):
+        """Test that async metric updates are applied once the queue is drained."""
+        from django_prometheus.db.async_metrics import metric_events
+        from django_prometheus.db.backends.postgresql_aws.base import _cursor_cls_for
+
+        # Keep the background thread out of the way so draining is deterministic.
+        with patch.object(metric_events, 'start'):
+            cursor = _cursor_cls_for('async_test', 'postgresql', True)(MagicMock())
+
+        initial_executes = execute_total.labels('async_test', 'postgresql')._value.get() or 0
+
+        # Python 3.13 warns when a functools.partial is called through an instance.
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            cursor.execute("SELECT 1")
+        self.assertEqual(execute_total.labels('async_test', 'postgresql')._value.get(), initial_executes)
+
+        metric_events.drain()
+        self.assertEqual(execute_total.labels('async_test', 'postgresql')._value.get(), initial_executes + 1)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_connection_pool_reuse(self, mock_aws_wrapper, mock_psycopg):
+        """Test that pooled connections are reused instead of reconnecting."""
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+        from django_prometheus.db.backends.postgresql_aws.pool import ConnectionPool
+
+        config = self.database_config.copy()
+        config['OPTIONS'] = dict(config['OPTIONS'], MAX_CONNS=2)
+        wrapper = DatabaseWrapper(config, alias='default')
+
+        conn_params = {'host': 'pool-test-host', 'port': 5432, 'options': {}}
+        pooled_connection = MagicMock()
+        ConnectionPool.for_alias('default', conn_params, 2).put(pooled_connection)
+
+        initial_hits = aws_pool_hits_total.labels('default', 'postgresql')._value.get() or 0
+
+        connection = wrapper.get_new_connection(conn_params)
+
+        self.assertIs(connection, pooled_connection)
+        mock_aws_wrapper.connect.assert_not_called()
+        final_hits = aws_pool_hits_total.labels('default', 'postgresql')._value.get()
+        self.assertEqual(final_hits, initial_hits + 1)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_close_releases_connection_to_pool(self, mock_aws_wrapper, mock_psycopg):
+        """Test that closing a pooled connection hands it back after a rollback."""
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+        from django_prometheus.db.backends.postgresql_aws.pool import ConnectionPool
+
+        wrapper = DatabaseWrapper(self.database_config, alias='default')
+        wrapper._pool = ConnectionPool(max_conns=1)
+        mock_connection = MagicMock()
+        wrapper.connection = mock_connection
+
+        wrapper._close()
+
+        mock_connection.rollback.assert_called_once()
+        mock_connection.close.assert_not_called()
+        self.assertIs(wrapper._pool.get(), mock_connection)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_close_releases_connection_outside_transaction(self, mock_aws_wrapper, mock_psycopg):
+        """Test that a connection not in autocommit goes back to the pool without an open transaction."""
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+        from django_prometheus.db.backends.postgresql_aws.pool import ConnectionPool
+
+        wrapper = DatabaseWrapper(self.database_config, alias='default')
+        wrapper._pool = ConnectionPool(max_conns=1)
+        mock_connection = MagicMock()
+        mock_connection.autocommit = False
+        wrapper.connection = mock_connection
+
+        wrapper._close()
+
+        # Without autocommit the usability check's SELECT 1 starts a
+        # transaction, so the rollback has to come after it.
+        calls = [name for name, _, _ in mock_connection.mock_calls]
+        self.assertIn('cursor().__enter__().execute', calls)
+        self.assertEqual(calls[-1], 'rollback')
+        self.assertIs(wrapper._pool.get(), mock_connection)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_close_does_not_pool_unreleasable_connections(self, mock_aws_wrapper, mock_psycopg):
+        """Test that connections are really closed when they can't go back to the pool."""
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+        from django_prometheus.db.backends.postgresql_aws.pool import ConnectionPool
+
+        wrapper = DatabaseWrapper(self.database_config, alias='default')
+
+        # Inside an atomic block, Django keeps referencing the connection.
+        wrapper._pool = ConnectionPool(max_conns=1)
+        wrapper.connection = MagicMock()
+        wrapper.in_atomic_block = True
+        wrapper._close()
+        wrapper.connection.close.assert_called_once()
+        self.assertIsNone(wrapper._pool.get())
+        wrapper.in_atomic_block = False
+
+        # A connection whose rollback fails is broken.
+        wrapper.connection = MagicMock()
+        wrapper.connection.rollback.side_effect = OSError("connection lost")
+        wrapper._close()
+        wrapper.connection.close.assert_called_once()
+        self.assertIsNone(wrapper._pool.get())
+
+        # The pool is full.
+        wrapper._pool.put(MagicMock())
+        wrapper.connection = MagicMock()
+        wrapper._close()
+        wrapper.connection.close.assert_called_once()
+
+    def test_connection_pool_reset_after_fork(self):
+        """Test that a forked child doesn't reuse connections pooled by its parent."""
+        from django_prometheus.db.backends.postgresql_aws import pool
+
+        conn_params = {'host': 'fork-test-host'}
+        parent_pool = pool.ConnectionPool.for_alias('default', conn_params, 1)
+        inherited_connection = MagicMock()
+        parent_pool.put(inherited_connection)
+
+        pool._reset_after_fork()
+
+        child_pool = pool.ConnectionPool.for_alias('default', conn_params, 1)
+        self.assertIsNot(child_pool, parent_pool)
+        self.assertIsNone(child_pool.get())
+        inherited_connection.close.assert_not_called()
+
+    def test_connection_pool_capacity(self):
+        """Test that the pool refuses connections beyond its capacity."""
+        from django_prometheus.db.backends.postgresql_aws.pool import ConnectionPool
+
+        pool = ConnectionPool(max_conns=1)
+        self.assertTrue(pool.put(MagicMock()))
+        self.assertFalse(pool.put(MagicMock()))
+        self.assertIsNotNone(pool.get())
+        self.assertIsNone(pool.get())
+
+    def test_connection_pool_closed_on_params_change(self):
+        """Test that an alias's idle connections are closed when it connects elsewhere."""
+        from django_prometheus.db.backends.postgresql_aws.pool import ConnectionPool
+
+        old_pool = ConnectionPool.for_alias('default', {'host': 'old-writer'}, 2)
+        self.assertIs(ConnectionPool.for_alias('default', {'host': 'old-writer'}, 2), old_pool)
+        idle_connection = MagicMock()
+        old_pool.put(idle_connection)
+
+        new_pool = ConnectionPool.for_alias('default', {'host': 'new-writer'}, 2)
+
+        self.assertIsNot(new_pool, old_pool)
+        idle_connection.close.assert_called_once()
+        # Connections checked out of the old pool are closed by their owner.
+        self.assertFalse(old_pool.put(MagicMock()))
+        self.assertIsNone(old_pool.get())
+
+    @patch('django_prometheus.db.backends.postgresql_aws.pool.time')
+    def test_connection_pool_max_idle(self, mock_time):
+        """Test that connections idle for longer than max_idle are closed instead of reused."""
+        from django_prometheus.db.backends.postgresql_aws.pool import ConnectionPool
+
+        pool = ConnectionPool(max_conns=2, max_idle=300)
+        stale_connection = MagicMock()
+        fresh_connection = MagicMock()
+        mock_time.monotonic.return_value = 0
+        pool.put(stale_connection)
+        mock_time.monotonic.return_value = 200
+        pool.put(fresh_connection)
+
+        mock_time.monotonic.return_value = 400
+        self.assertIs(pool.get(), fresh_connection)
+        self.assertIsNone(pool.get())
+        stale_connection.close.assert_called_once()
+        fresh_connection.close.assert_not_called()
+
+    def test_writer_discovery_lookup(self):
+        """Test that writer discovery resolves the writer instance endpoint."""
+        mock_boto3 = MagicMock()
+        client = mock_boto3.client.return_value
+        client.describe_db_clusters.return_value = {
+            'DBClusters': [{
+                'DBClusterMembers': [
+                    {'DBInstanceIdentifier': 'reader-1', 'IsClusterWriter': False},
+                    {'DBInstanceIdentifier': 'writer-1', 'IsClusterWriter': True},
+                ],
+            }],
+        }
+        client.describe_db_instances.return_value = {
+            'DBInstances': [{'Endpoint': {'Address': 'writer-1.xyz.us-east-1.rds.amazonaws.com'}}],
+        }
+
+        with patch.dict('sys.modules', {'boto3': mock_boto3}):
+            from django_prometheus.db.backends.postgresql_aws.writer_discovery import WriterDiscovery
+            discovery = WriterDiscovery('test-cluster', region='us-east-1')
+
+        self.assertIsNone(discovery.writer_endpoint)
+        self.assertEqual(discovery._lookup_writer(), 'writer-1.xyz.us-east-1.rds.amazonaws.com')
+        self.assertEqual(discovery._lookup_writer(), 'writer-1.xyz.us-east-1.rds.amazonaws.com')
+        client.describe_db_instances.assert_called_once_with(DBInstanceIdentifier='writer-1')
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_writer_discovery_rewrites_host(self, mock_aws_wrapper, mock_psycopg):
+        """Test that new connections go to the discovered writer endpoint."""
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+
+        wrapper = DatabaseWrapper(self.database_config, alias='default')
+        wrapper._writer_discovery = MagicMock(writer_endpoint='writer-1.xyz.us-east-1.rds.amazonaws.com')
+
+        wrapper.get_new_connection({'host': 'test-cluster.cluster-xyz.us-east-1.rds.amazonaws.com', 'options': {}})
+        self.assertEqual(
+            mock_aws_wrapper.connect.call_args[1]['host'], 'writer-1.xyz.us-east-1.rds.amazonaws.com'
+        )
+
+        # Until the first lookup succeeds, the configured host is used.
+        wrapper._writer_discovery.writer_endpoint = None
+        wrapper.get_new_connection({'host': 'test-cluster.cluster-xyz.us-east-1.rds.amazonaws.com', 'options': {}})
+        self.assertEqual(
+            mock_aws_wrapper.connect.call_args[1]['host'], 'test-cluster.cluster-xyz.us-east-1.rds.amazonaws.com'
+        )
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_writer_discovery_refreshed_on_failover(self, mock_aws_wrapper, mock_psycopg):
+        """Test that a successful failover asks writer discovery for an immediate lookup."""
+        from aws_advanced_python_wrapper.errors import FailoverSuccessError
+
+        from django_prometheus.db.backends.postgresql_aws.base import _cursor_cls_for
+
+        mock_discovery = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.execute.side_effect = [FailoverSuccessError(), None]
+        cursor = _cursor_cls_for('default', 'postgresql')(mock_cursor)
+
+        with patch.dict(
+            'django_prometheus.db.backends.postgresql_aws.base._writer_discoveries', {'default': mock_discovery}
+        ):
+            cursor.execute("SELECT 1")
+
+        mock_discovery.refresh.assert_called_once_with()
+
+    def test_writer_discovery_restarts_after_fork(self):
+        """Test that a forked child polls again instead of trusting the parent's writer."""
+        mock_boto3 = MagicMock()
+
+        with patch.dict('sys.modules', {'boto3': mock_boto3}):
+            from django_prometheus.db.backends.postgresql_aws import writer_discovery
+
+            discovery = writer_discovery.WriterDiscovery('test-cluster', region='us-east-1')
+            discovery.writer_endpoint = 'old-writer.xyz.us-east-1.rds.amazonaws.com'
+            writer_discovery.WriterDiscovery._instances['test-cluster'] = discovery
+
+            with patch.object(discovery, 'start') as mock_start:
+                writer_discovery._restart_after_fork()
+
+        self.assertIsNone(discovery.writer_endpoint)
+        mock_start.assert_called_once_with()
+        self.assertEqual(mock_boto3.client.call_count, 2)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_circuit_breaker_short_circuits(self, mock_aws_wrapper, mock_psycopg):
+        """Test that repeated connection failures open the circuit."""
+        from django.db import OperationalError
+
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+
+        mock_aws_wrapper.connect.side_effect = OSError("Connection failed")
+
+        config = self.database_config.copy()
+        config['OPTIONS'] = dict(config['OPTIONS'], circuit_breaker_threshold=2)
+        wrapper = DatabaseWrapper(config, alias='circuit_test')
+
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                wrapper.get_new_connection({'host': 'circuit-test-host', 'options': {}})
+
+        initial_rejected = circuit_short_circuited_total.labels('circuit_test', 'postgresql')._value.get() or 0
+
+        with self.assertRaises(OperationalError):
+            wrapper.get_new_connection({'host': 'circuit-test-host', 'options': {}})
+
+        self.assertEqual(mock_aws_wrapper.connect.call_count, 2)
+        final_rejected = circuit_short_circuited_total.labels('circuit_test', 'postgresql')._value.get()
+        self.assertEqual(final_rejected, initial_rejected + 1)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.circuit_breaker.time')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.psycopg')
+    @patch('django_prometheus.db.backends.postgresql_aws.base.AwsWrapperConnection')
+    def test_circuit_breaker_interrupted_trial(self, mock_aws_wrapper, mock_psycopg, mock_time):
+        """Test that a trial connect interrupted by a BaseException re-opens the circuit."""
+        from django_prometheus.db.backends.postgresql_aws.base import DatabaseWrapper
+        from django_prometheus.db.backends.postgresql_aws.circuit_breaker import OPEN
+
+        mock_time.monotonic.return_value = 0
+        mock_connection = MagicMock()
+        mock_aws_wrapper.connect.side_effect = [OSError("Connection failed"), KeyboardInterrupt(), mock_connection]
+
+        config = self.database_config.copy()
+        config['OPTIONS'] = dict(config['OPTIONS'], circuit_breaker_threshold=1, circuit_breaker_reset_timeout=30)
+        wrapper = DatabaseWrapper(config, alias='circuit_interrupt_test')
+        conn_params = {'host': 'circuit-test-host', 'options': {}}
+
+        with self.assertRaises(OSError):
+            wrapper.get_new_connection(conn_params)
+
+        mock_time.monotonic.return_value = 30
+        with self.assertRaises(KeyboardInterrupt):
+            wrapper.get_new_connection(conn_params)
+        self.assertEqual(wrapper._circuit_breaker.state, OPEN)
+
+        mock_time.monotonic.return_value = 60
+        self.assertIs(wrapper.get_new_connection(conn_params), mock_connection)
+
+    @patch('django_prometheus.db.backends.postgresql_aws.circuit_breaker.time')
+    def test_circuit_breaker_half_open(self, mock_time):
+        """Test that an open circuit lets one trial through after the timeout."""
+        from django_prometheus.db.backends.postgresql_aws.circuit_breaker import CircuitBreaker
+
+        mock_time.monotonic.return_value = 0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        self.assertTrue(breaker.record_failure())
+        self.assertFalse(breaker.allow_request())
+
+        mock_time.monotonic.return_value = 30
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+
+        # A trial that never reports back doesn't keep the circuit shut.
+        mock_time.monotonic.return_value = 60
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertTrue(breaker.allow_request())
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file